@@ -0,0 +1,213 @@
+# Shared constants and data/model helpers for the price predictor app
+import os
+import streamlit as st
+import pandas as pd
+import numpy as np
+import altair as alt
+import numba
+import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import httpx
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+# Static HTML blocks
+CSS_BLOCK = """
+<style>
+    .reportview-container {
+        background: #f0f2f6;
+    }
+    .big-font {
+        font-size:30px !important;
+        font-weight: bold;
+    }
+    .medium-font {
+        font-size:20px !important;
+        font-weight: bold;
+    }
+    .small-font {
+        font-size:14px !important;
+    }
+    .stButton>button {
+        background-color: #4CAF50;
+        color: white;
+    }
+</style>
+"""
+
+DISCLAIMER_BLOCK = """
+<p class="small-font">
+<b>How we calculate prices:</b><br>
+1. We use historical commodity prices in USD from either CSV files or Yahoo Finance.<br>
+2. These prices are converted to INR using the current exchange rate.<br>
+3. Historical data is used to predict future prices using a simple linear regression model.<br><br>
+<b>Disclaimer:</b> These predictions are based on historical data and should not be used as the sole basis for financial decisions. 
+Many factors can influence agricultural prices. Local market prices may vary due to additional factors not considered in this model.
+</p>
+"""
+
+# Dictionary of products, their tickers, and CSV filenames
+products = {
+    'Wheat': {'ticker': 'ZW=F', 'csv': 'wheat.csv'},
+    'Rice': {'ticker': 'ZR=F', 'csv': 'rice.csv'},
+    'Corn': {'ticker': 'ZC=F', 'csv': 'corn.csv'},
+    'Soybean': {'ticker': 'ZS=F', 'csv': 'soybean.csv'},
+    'Cotton': {'ticker': 'CT=F', 'csv': 'cotton.csv'},
+    'Sugar': {'ticker': 'SB=F', 'csv': 'sugar.csv'},
+    'Coffee': {'ticker': 'KC=F', 'csv': 'coffee.csv'},
+    'Cocoa': {'ticker': 'CC=F', 'csv': 'cocoa.csv'},
+    'Oats': {'ticker': 'ZO=F', 'csv': 'oats.csv'},
+    'Orange Juice': {'ticker': 'OJ=F', 'csv': 'orange_juice.csv'},
+}
+PRODUCT_NAMES = tuple(products.keys())
+PRODUCT_TICKERS = tuple(p['ticker'] for p in products.values())
+PRODUCT_CSVS = tuple(p['csv'] for p in products.values())
+FUTURE_DAYS = 180  # 6 months
+
+# Shared HTTP client so connections are reused (HTTP/2 keep-alive) across cache misses
+@st.cache_resource
+def get_http_client():
+    return httpx.Client(http2=True, timeout=5.0)
+
+# Function to fetch USD exchange rates, retrying transient network failures
+@retry(
+    retry=retry_if_exception_type(httpx.TransportError),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.5, max=4),
+    reraise=True,
+)
+def fetch_usd_rates():
+    response = get_http_client().get("https://api.exchangerate-api.com/v4/latest/USD")
+    response.raise_for_status()
+    return response.json()['rates']
+
+# Function to get current USD to INR exchange rate
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_usd_to_inr_rate():
+    try:
+        return fetch_usd_rates()['INR']
+    except (httpx.HTTPError, KeyError, ValueError):
+        st.error("Failed to fetch current exchange rate. Using 1 USD = 75 INR as a fallback.")
+        return 75  # Fallback exchange rate if API fails
+
+# Function to read a product data file, preferring a pre-converted Parquet copy
+# unless the CSV has been modified since it was converted
+def read_product_file(filename):
+    parquet_filename = os.path.splitext(filename)[0] + '.parquet'
+    if os.path.exists(parquet_filename) and (
+        not os.path.exists(filename) or os.path.getmtime(parquet_filename) >= os.path.getmtime(filename)
+    ):
+        return pd.read_parquet(parquet_filename)
+    return pd.read_csv(filename)
+
+# Function to read every product CSV in parallel once per process. Files that are missing
+# or fail to read map to None, so one bad file cannot break the prefetch for the others.
+@st.cache_resource
+def prefetch_all_csvs():
+    def read_or_none(filename):
+        try:
+            return read_product_file(filename)
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return dict(zip(PRODUCT_CSVS, executor.map(read_or_none, PRODUCT_CSVS)))
+
+# Function to load CSV data from the prefetched frames, re-reading files that were missing
+# or unreadable at prefetch time so ones added or fixed later are picked up without a restart
+def load_csv_data(filename):
+    frames = prefetch_all_csvs()
+    df = frames.get(filename)
+    if df is None:
+        df = read_product_file(filename)  # Raises the file's own error (e.g. FileNotFoundError) if still bad
+        frames[filename] = df
+    return df.copy()  # The prefetched frames are shared, so callers get their own copy
+
+# Function to fetch data for all tickers from Yahoo Finance in a single request
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def fetch_yahoo_finance_data(tickers, start_date, end_date):
+    data = yf.download(list(tickers), start=start_date, end=end_date, threads=True)
+    return data['Close']
+
+# Function to convert prices to INR, compute day offsets, fit a linear trend and
+# predict future prices in a single compiled pass (prices is updated in place)
+@numba.njit(cache=True)
+def prep_and_predict(date_ns, prices, fx, future_days):
+    n = prices.size
+    days = np.empty(n, dtype=np.int64)
+    date_min = date_ns.min()
+    last_day = 0
+    sx = sy = sxx = sxy = 0.0
+    for i in range(n):
+        d = (date_ns[i] - date_min) // 86_400_000_000_000  # nanoseconds per day
+        p = prices[i] * fx
+        days[i] = d
+        prices[i] = p
+        last_day = max(last_day, d)
+        sx += d
+        sy += p
+        sxx += d * d
+        sxy += d * p
+    denom = n * sxx - sx * sx
+    slope = (n * sxy - sx * sy) / denom if denom != 0.0 else 0.0
+    intercept = (sy - slope * sx) / n
+    future_prices = np.empty(future_days, dtype=np.float64)
+    for j in range(future_days):
+        future_prices[j] = slope * (last_day + 1 + j) + intercept
+    return days, prices, future_prices, slope, intercept
+
+# Function to load a product's prices, convert them to INR and fit/predict the trend.
+# Keyed on (product, source, day, rate) so reruns from unrelated widgets skip the whole pipeline.
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def fit_product_prices(product_name, data_source, date_bucket, usd_to_inr_rate):
+    if data_source == "CSV":
+        df = load_csv_data(products[product_name]['csv'])
+        df.columns = ['Date', 'Price']  # Ensure column names are correct
+        df = df.dropna()  # Missing prices would turn the whole fit into NaN
+    else:  # Yahoo Finance
+        end_date = date_bucket
+        start_date = end_date - timedelta(days=180)  # 6 months of historical data
+        all_closes = fetch_yahoo_finance_data(PRODUCT_TICKERS, start_date, end_date)
+        closes = all_closes[products[product_name]['ticker']].dropna()
+        df = pd.DataFrame({'Date': closes.index.values, 'Price': closes.values}, copy=False)
+
+    if df.empty:
+        return df, None, None
+
+    # Prepare data for model
+    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'])
+    # Prices are converted to INR in place, so use an owned float64 buffer (the column may be a read-only view)
+    prices = df['Price'].to_numpy(dtype=np.float64, copy=True)
+    date_ns = df['Date'].values.astype('datetime64[ns]', copy=False).view('i8')
+
+    # Train model and predict future prices
+    days, prices, future_prices, slope, intercept = prep_and_predict(date_ns, prices, float(usd_to_inr_rate), FUTURE_DAYS)
+    df['Price'] = prices
+    df['Days'] = days
+    last_date = df['Date'].values.max().astype('datetime64[D]')
+    future_dates = last_date + np.arange(1, FUTURE_DAYS + 1, dtype='timedelta64[D]')
+    return df, future_dates, future_prices
+
+# Function to build the Vega-Lite spec for the price chart (data inlined).
+# Keyed on the same cheap tuple as fit_product_prices instead of hashing the chart data.
+@st.cache_data(ttl=3600, max_entries=64)  # Cache for 1 hour
+def build_price_chart_spec(product_name, data_source, date_bucket, usd_to_inr_rate):
+    df, future_dates, future_prices = fit_product_prices(product_name, data_source, date_bucket, usd_to_inr_rate)
+
+    # Combine historical and future data
+    all_dates = np.concatenate([df['Date'].values.astype('datetime64[ns]', copy=False), future_dates.astype('datetime64[ns]')])
+    # Round to the 2 decimals shown in the app so the inlined JSON prices stay short
+    all_prices = np.round(np.concatenate([df['Price'].values, future_prices]), 2)
+    all_types = np.repeat(np.array(['Historical', 'Predicted'], dtype=object), [len(df), FUTURE_DAYS])
+    all_data = pd.DataFrame({'Date': all_dates, 'Price': all_prices, 'Type': all_types}, copy=False)
+
+    chart = alt.Chart(all_data).mark_line().encode(
+        x='Date:T',
+        y=alt.Y('Price:Q', scale=alt.Scale(zero=False)),
+        color='Type:N'
+    ).properties(
+        width=700,
+        height=400
+    ).interactive()
+    return chart.to_dict()
@@ -0,0 +1,21 @@
+import sys
+import os
+import pandas as pd
+from common import PRODUCT_CSVS
+
+# One-shot conversion of product price CSVs to Parquet so the app can skip CSV parsing.
+# Usage: python convert_csv_to_parquet.py [file.csv ...]  (defaults to the product CSVs the app reads)
+def convert(filename):
+    df = pd.read_csv(filename)
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'])
+    parquet_filename = os.path.splitext(filename)[0] + '.parquet'
+    df.to_parquet(parquet_filename, index=False)
+    print(f"{filename} -> {parquet_filename}")
+
+if __name__ == '__main__':
+    for filename in sys.argv[1:] or PRODUCT_CSVS:
+        if not os.path.exists(filename):
+            print(f"{filename} not found, skipping")
+            continue
+        convert(filename)